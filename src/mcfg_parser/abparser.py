@@ -1,7 +1,11 @@
 from .grammar import MultipleContextFreeGrammar, MCFGRuleElement, MCFGRuleElementInstance
 from .tree import Tree
 from abc import ABC
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from functools import lru_cache, partial
+from heapq import merge
 
 class NormalForm(Enum):
     CNF = 0
@@ -28,19 +32,29 @@ class ABEntry():
     backpointers : tuple[int, MCFGRuleElement]
     """
 
+    __slots__ = ('_symbol', '_index', '_backpointers', '_tuple', '_hash')
+
     def __init__(self, symbol: MCFGRuleElementInstance, index: int, *backpointers: ABBackPointer):
         self._symbol = symbol
         self._index = index
         self._backpointers = backpointers
+        self._tuple = (symbol.variable, index, backpointers)
+        self._hash = hash(self._tuple)
 
     def to_tuple(self):
-        return (self._symbol.variable, self.index, self._backpointers)
-        
+        return self._tuple
+
     def __hash__(self) -> int:
-        return hash(self.to_tuple())
+        return self._hash
 
     def __eq__(self, other: 'ABEntry') -> bool:
-        return self.to_tuple() == other.to_tuple()
+        if self is other:
+            return True
+        if not isinstance(other, ABEntry):
+            return NotImplemented
+        if self._hash != other._hash:
+            return False
+        return self._tuple == other._tuple
     
     def __repr__(self) -> str:
         if not self.backpointers or not any(bp for bps in self.backpointers for bp in bps):
@@ -90,7 +104,27 @@ class Parser(ABC):
         else:
             msg = 'mode must be "parse" or "recognize"'
             raise ValueError(msg)
-        
+
+    def parse_batch(self, strings, mode="recognize", max_workers=None):
+        """
+        Parse a batch of sentences, distributing them over a process pool
+
+        Parameters
+        ----------
+        strings : list of sentences
+        mode : either 'recognize' or 'parse', 'recognize' is the default value
+        max_workers : int, pool size; 1 forces sequential parsing
+
+        Returns
+        -------
+        list of per-sentence results, in input order
+        """
+        strings = list(strings)
+        if len(strings) <= 1 or max_workers == 1:
+            return [self(s, mode) for s in strings]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(partial(self, mode=mode), strings))
+
     @property
     def grammar(self):
         return self._grammar
@@ -107,6 +141,17 @@ class AgendaBasedParser(Parser):
     normal_form = NormalForm.CNF
     def __init__(self, grammar: MultipleContextFreeGrammar):
         self._grammar = grammar
+        self._partners = self._build_partner_map()
+
+    def _build_partner_map(self) -> dict[str, set[str]]:
+        """Map each right side variable to the variables it can combine with"""
+        partners = {}
+        for key in self._grammar._rules_by_rhs_vars:
+            if len(key) == 2:
+                first, second = key
+                partners.setdefault(first, set()).add(second)
+                partners.setdefault(second, set()).add(first)
+        return partners
 
     @property
     def grammar(self):
@@ -117,57 +162,97 @@ class AgendaBasedParser(Parser):
         sv = {ele.variable for ele in self.grammar._start_variables}
         start_nodes = [entry for entry in chart if entry.symbol.variable in sv and entry.symbol._string_spans == ((0, len(string)),)]
         if len(start_nodes) >= 1:
-            return {self._construct_parses(chart, string, s) for s in start_nodes}
+            chart_index = {e.index: e for e in chart}
+            memo = {}
+            return {self._construct_parses(chart, string, s, chart_index, memo) for s in start_nodes}
         else:
             print("Unable to parse this sentence.")
         return None
         
     def _recognize(self, string):
-        chart = self._fill_chart(string)
         sv = {ele.variable for ele in self.grammar._start_variables}
-        return any([entry for entry in chart if entry.symbol.variable in sv and entry.symbol._string_spans == ((0, len(string)),)])
+        target = ((0, len(string)),)
+        def accepts(entry):
+            return entry.symbol.variable in sv and entry.symbol._string_spans == target
+        chart = self._fill_chart_work(tuple(string), accepts)
+        return any(accepts(entry) for entry in chart)
     
     def _combine(self, current: ABEntry, element: ABEntry) -> tuple[int, tuple[MCFGRuleElementInstance]]:
         reversed = 0
         possible_rules = self.grammar.reduce(current.symbol, element.symbol)
-        if possible_rules == set():
+        if not possible_rules:
             reversed = 1
             possible_rules = self.grammar.reduce(element.symbol, current.symbol)
-            if possible_rules == set():
+            if not possible_rules:
                 return 0, None
             else:
-                result = tuple(i for i in [r.instantiate_left_side(element.symbol, current.symbol) for r in possible_rules] if i is not None)
+                result = tuple(i for i in [r.instantiate_left_side(element.symbol, current.symbol) for r in sorted(possible_rules, key=str)] if i is not None)
                 return reversed, result
         else:
-            result = tuple(i for i in [r.instantiate_left_side(current.symbol, element.symbol) for r in possible_rules] if i is not None)
+            result = tuple(i for i in [r.instantiate_left_side(current.symbol, element.symbol) for r in sorted(possible_rules, key=str)] if i is not None)
         return reversed, result
 
     def _fill_chart(self, string: list[str]) -> list[ABEntry]:
-        agenda = []
+        return self._fill_chart_cached(tuple(string))
+
+    @lru_cache(2**6)
+    def _fill_chart_cached(self, string: tuple[str, ...]) -> list[ABEntry]:
+        return self._fill_chart_work(string)
+
+    def _fill_chart_work(self, string: tuple[str, ...], stop_predicate=None) -> list[ABEntry]:
+        agenda = deque()
+        next_id = 0
+        lexicon = self.grammar._lexicon
         for idx, word in enumerate(string):
-            possible_rules = self.grammar.parts_of_speech(word)
-            for n, rule in enumerate(possible_rules):
-                agenda.append(ABEntry(rule.instantiate_left_side(MCFGRuleElementInstance(word, (idx, idx+1))), 0, (None, None)))
-        for n, e in enumerate(agenda):
-            e._index = n
+            for rule in lexicon.get(word, ()):
+                agenda.append(ABEntry(rule.instantiate_left_side(MCFGRuleElementInstance(word, (idx, idx+1))), next_id, (None, None)))
+                next_id += 1
+        if stop_predicate is not None:
+            for e in agenda:
+                if stop_predicate(e):
+                    return list(agenda)
+        seen = {(e.symbol._variable, e.symbol._string_spans, e.backpointers) for e in agenda}
         chart = []
-        chart_ids = set() 
-        next_id = n+1
+        chart_by_var = {}
+        pop_next = agenda.popleft
+        push = agenda.append
+        combine = self._combine
+        partners_get = self._partners.get
+        seen_add = seen.add
+        chart_append = chart.append
         while agenda:
-            current = agenda.pop(0)
-            for element in chart:
-                r, combination = self._combine(current, element)
+            current = pop_next()
+            current_index = current.index
+            current_variable = current.symbol.variable
+            buckets = [chart_by_var[v]
+                       for v in partners_get(current_variable, ())
+                       if v in chart_by_var]
+            if len(buckets) == 1:
+                candidates = buckets[0]
+            else:
+                candidates = merge(*buckets)
+            for element_index, element in candidates:
+                r, combination = combine(current, element)
                 if combination:
+                    element_variable = element.symbol.variable
                     for c in combination:
                         if r:
-                            new_parse = ABEntry(c, next_id, ((element.index, element.symbol.variable), (current.index, current.symbol.variable)))
+                            backpointer = ((element_index, element_variable), (current_index, current_variable))
                         else:
-                            new_parse = ABEntry(c, next_id, ((current.index, current.symbol.variable), (element.index, element.symbol.variable)))
-                        next_id += 1 
-                        agenda.append(new_parse)
-            if current.index not in chart_ids:
-                chart.append(current)
-                chart_ids.add(current.index)
+                            backpointer = ((current_index, current_variable), (element_index, element_variable))
+                        key = (c._variable, c._string_spans, (backpointer,))
+                        if key in seen:
+                            continue
+                        seen_add(key)
+                        new_entry = ABEntry(c, next_id, backpointer)
+                        next_id += 1
+                        if stop_predicate is not None and stop_predicate(new_entry):
+                            chart_append(current)
+                            chart_append(new_entry)
+                            return chart
+                        push(new_entry)
+            chart_append(current)
+            chart_by_var.setdefault(current_variable, []).append((current_index, current))
         return chart
     
     def _get_item(self, inventory: list[ABEntry], index:int) -> ABEntry:
@@ -177,14 +262,25 @@ class AgendaBasedParser(Parser):
                     return i
         return None
 
-    def _construct_parses(self, chart: list[ABEntry], string: str, entry: ABEntry | None = None) -> Tree:
+    def _construct_parses(self, chart: list[ABEntry], string: str, entry: ABEntry | None = None, chart_index: dict[int, ABEntry] | None = None, memo: dict[int, Tree] | None = None) -> Tree:
+        if chart_index is None:
+            chart_index = {e.index: e for e in chart}
+        if memo is None:
+            memo = {}
+        cached = memo.get(entry.index)
+        if cached is not None:
+            return cached
         if not entry.backpointers or not any(bp for bps in entry.backpointers for bp in bps):
-            return Tree(''.join([entry.symbol.variable, '(', string[entry.symbol.string_spans[0][0]], ')']))
+            tree = Tree(''.join([entry.symbol.variable, '(', string[entry.symbol.string_spans[0][0]], ')']))
+            memo[entry.index] = tree
+            return tree
         children = []
         for component_bps in entry.backpointers:
             for bp in component_bps:
                 child_entry_id, _ = bp
-                child_entry = self._get_item(chart, child_entry_id)
-                children.append(self._construct_parses(chart, string, child_entry))
-        return Tree(entry.symbol.variable, children)
+                child_entry = chart_index.get(child_entry_id)
+                children.append(self._construct_parses(chart, string, child_entry, chart_index, memo))
+        tree = Tree(entry.symbol.variable, children)
+        memo[entry.index] = tree
+        return tree
         
\ No newline at end of file
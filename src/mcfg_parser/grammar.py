@@ -1,11 +1,11 @@
 import re
+import sys
 import pyparsing # type: ignore
 from typing import TypeVar, Optional
 from collections.abc import Hashable, Callable
 from typing import Literal
 from functools import lru_cache
 from enum import Enum
-from copy import deepcopy
 
 
 class NormalForm(Enum):
@@ -35,29 +35,41 @@ class MCFGRuleElement:
     string_variables
     """
 
+    __slots__ = ('_variable', '_string_variables', '_tuple', '_hash', '_unique_string_variables')
+
     def __init__(self, variable: str, *string_variables: StringVariables):
-        self._variable = variable
+        self._variable = sys.intern(variable)
         self._string_variables = string_variables
+        self._tuple = (self._variable, string_variables)
+        self._hash = hash(self._tuple)
+        self._unique_string_variables = frozenset(
+            i
+            for tup in string_variables
+            for i in tup
+        )
 
     def __str__(self) -> str:
         strvars = ', '.join(
             ''.join(str(v) for v in vtup)
             for vtup in self._string_variables
         )
-        
+
         return f"{self._variable}({strvars})"
 
     def __eq__(self, other) -> bool:
+        if self._hash != other._hash:
+            return False
+
         vareq = self._variable == other._variable
         strvareq = self._string_variables == other._string_variables
-        
+
         return vareq and strvareq
-        
+
     def to_tuple(self) -> tuple[str, tuple[StringVariables, ...]]:
-        return (self._variable, self._string_variables)
+        return self._tuple
 
     def __hash__(self) -> int:
-        return hash(self.to_tuple())
+        return self._hash
         
     @property
     def variable(self) -> str:
@@ -67,13 +79,9 @@ class MCFGRuleElement:
     def string_variables(self) -> tuple[StringVariables, ...]:
         return self._string_variables
 
-    @property    
-    def unique_string_variables(self) -> set[int]:
-        return {
-            i
-            for tup in self.string_variables
-            for i in tup
-        }
+    @property
+    def unique_string_variables(self) -> frozenset[int]:
+        return self._unique_string_variables
     
 
 class MCFGRuleElementInstance:
@@ -90,21 +98,28 @@ class MCFGRuleElementInstance:
     symbol
     string_spans
     """
+    __slots__ = ('_variable', '_string_spans', '_tuple', '_hash')
+
     def __init__(self, variable: str, *string_spans: SpanIndices):
-        self._variable = variable
+        self._variable = sys.intern(variable)
         self._string_spans = string_spans
+        self._tuple = (self._variable, string_spans)
+        self._hash = hash(self._tuple)
 
     def __eq__(self, other: 'MCFGRuleElementInstance') -> bool:
+        if self._hash != other._hash:
+            return False
+
         vareq = self._variable == other._variable
         strspaneq = self._string_spans == other._string_spans
-        
+
         return vareq and strspaneq
-        
+
     def to_tuple(self) -> tuple[str, tuple[SpanIndices, ...]]:
-        return (self._variable, self._string_spans)
+        return self._tuple
 
     def __hash__(self) -> int:
-        return hash(self.to_tuple())
+        return self._hash
 
     def __str__(self):
         strspans = ', '.join(
@@ -141,17 +156,27 @@ class MCFGRule:
     right_side
     """
 
+    ELEMENT_RE = re.compile(r'(\w+)\(((?:\w+,? ?)+?)\)')
+
+    __slots__ = ('_left_side', '_right_side', '_tuple', '_hash', '_rhs_signature')
+
     def __init__(self, left_side: MCFGRuleElement, *right_side: MCFGRuleElement):
         self._left_side = left_side
         self._right_side = right_side
+        self._tuple = (left_side, right_side)
+        self._hash = hash(self._tuple)
+        self._rhs_signature = tuple(
+            (el.variable, len(el.string_variables))
+            for el in right_side
+        )
 
         self._validate()
 
     def to_tuple(self) -> tuple[MCFGRuleElement, tuple[MCFGRuleElement, ...]]:
-        return (self._left_side, self._right_side)
+        return self._tuple
 
     def __hash__(self) -> int:
-        return hash(self.to_tuple())
+        return self._hash
     
     def __repr__(self) -> str:
         return '<Rule: '+str(self)+'>'
@@ -220,6 +245,7 @@ class MCFGRule:
             for el in [self._left_side]+list(self._right_side)
         }
 
+    @lru_cache(2**14)
     def instantiate_left_side(self, *right_side: MCFGRuleElementInstance) -> MCFGRuleElementInstance:
         """Instantiate the left side of the rule given an instantiated right side
 
@@ -245,24 +271,17 @@ class MCFGRule:
 
         new_spans = []
         span_map = self._build_span_map(right_side)
-        
+
         for vs in self._left_side.string_variables:
-            for i in range(1,len(vs)):
-                end_prev = span_map[vs[i-1]][1]
-                begin_curr = span_map[vs[i]][0]
+            spans = [span_map[v] for v in vs]
 
-                if end_prev != begin_curr:
+            prev_end = spans[0][1]
+            for begin, end in spans[1:]:
+                if prev_end != begin:
                     return None
-                    """raise ValueError(
-                        f"Spans {span_map[vs[i-1]]} and {span_map[vs[i]]} "
-                        f"must be adjacent according to {self} but they "
-                        "are not."
-                    )"""
-                
-            begin_span = span_map[vs[0]][0]
-            end_span = span_map[vs[-1]][1]
+                prev_end = end
 
-            new_spans.append((begin_span, end_span))
+            new_spans.append((spans[0][0], prev_end))
 
         return MCFGRuleElementInstance(
             self._left_side.variable, *new_spans
@@ -293,19 +312,10 @@ class MCFGRule:
     def _right_side_aligns(self, right_side: tuple[MCFGRuleElementInstance, ...]) -> bool:
         """Check whether the right side aligns"""
 
-        if len(right_side) == len(self._right_side):
-            vars_match = all(
-                elem.variable == eleminst.variable
-                for elem, eleminst in zip(self._right_side, right_side)
-            )
-            strvars_match = all(
-                len(elem.string_variables) == len(eleminst.string_spans)
-                for elem, eleminst in zip(self._right_side, right_side)
-            )
-
-            return vars_match and strvars_match
-        else:
-            return False 
+        return self._rhs_signature == tuple(
+            (inst.variable, len(inst.string_spans))
+            for inst in right_side
+        )
 
     @classmethod
     def from_string(cls, rule_string: str) -> 'MCFGRule':
@@ -321,7 +331,7 @@ class MCFGRule:
         MCFGRule
         """
 
-        elem_strs = re.findall('(\w+)\(((?:\w+,? ?)+?)\)', rule_string)
+        elem_strs = cls.ELEMENT_RE.findall(rule_string)
 
         elem_tuples = [(var, [v.strip()
                               for v in svs.split(',')])
@@ -340,10 +350,11 @@ class MCFGRule:
                 msg = 'variables duplicated on right side of '+rule_string
                 raise ValueError(msg)
 
-            
+            strvar_re = re.compile('|'.join(strvars))
+
             elem_left = MCFGRuleElement(elem_tuples[0][0],
                                     *[tuple([strvars.index(v)
-                                             for v in re.findall('('+'|'.join(strvars)+')', vs)])
+                                             for v in strvar_re.findall(vs)])
                                       for vs in elem_tuples[0][1]])
 
             elems_right = [MCFGRuleElement(var, *[(strvars.index(sv),)
@@ -441,7 +452,7 @@ class MultipleContextFreeGrammar:
         self._rules = rules
         self._start_variables = start_variables
         if not variables:
-            self._variables = {i for r in self._rules for i in deepcopy(r.right_side) + ((deepcopy(r.left_side)),)}
+            self._variables = {i for r in self._rules for i in r.right_side + (r.left_side,)}
         else:
             self._variables = variables
         if not alphabet:
@@ -452,6 +463,34 @@ class MultipleContextFreeGrammar:
         self._validate_variables()
         self._validate_rules()
 
+        rules_by_rhs = {}
+        for rule in self._rules:
+            if not rule.is_epsilon:
+                rules_by_rhs.setdefault(rule._rhs_signature, set()).add(rule)
+        self._rules_by_rhs = {
+            signature: frozenset(rules)
+            for signature, rules in rules_by_rhs.items()
+        }
+
+        rules_by_rhs_vars = {}
+        for rule in self._rules:
+            if not rule.is_epsilon:
+                key = tuple(el.variable for el in rule.right_side)
+                rules_by_rhs_vars.setdefault(key, set()).add(rule)
+        self._rules_by_rhs_vars = {
+            key: frozenset(rules)
+            for key, rules in rules_by_rhs_vars.items()
+        }
+
+        lexicon = {}
+        for rule in self._rules:
+            if rule.is_epsilon:
+                lexicon.setdefault(rule.left_side.string_variables[0][0], []).append(rule)
+        self._lexicon = {
+            word: tuple(sorted(word_rules, key=str))
+            for word, word_rules in lexicon.items()
+        }
+
 
         if self.parser_class is not None:
             self._parser = self.parser_class(self)
@@ -525,30 +564,28 @@ class MultipleContextFreeGrammar:
 
 
     @lru_cache(2**14)
-    def parts_of_speech(self, word: str | None = None) -> set[MCFGRule]:
+    def parts_of_speech(self, word: str | None = None) -> frozenset[MCFGRule]:
         """
-        return all the epsilon rules that have the specified word, 
+        return all the epsilon rules that have the specified word,
         if there's no specified variable it will return all the epsilon rules
 
         Parameters
         ----------
         word : str
-        
+
         Returns
         -------
-        set[MCFGRule]
-        """ 
+        frozenset[MCFGRule]
+        """
         if word is None:
-            return {rule for rule in self._rules 
-                    if rule.is_epsilon}
+            return frozenset(rule for rule in self._rules
+                             if rule.is_epsilon)
         else:
-            return {rule for rule in self._rules 
-                    if rule.is_epsilon 
-                    if rule.left_side.string_variables[0][0] == word}
+            return frozenset(self._lexicon.get(word, ()))
     
 
-    @lru_cache(2^15)
-    def reduce(self, *right_side: MCFGRuleElementInstance) -> set[MCFGRuleElementInstance]:
+    @lru_cache(2**15)
+    def reduce(self, *right_side: MCFGRuleElementInstance) -> frozenset[MCFGRule]:
         """
         Return all the the nonterminals that can be rewritten as right_side
 
@@ -558,9 +595,12 @@ class MultipleContextFreeGrammar:
 
         Returns
         -------
-        set[MCFGRuleElementInstance]
+        frozenset[MCFGRule]
         """
-        return {r for r in self._rules
-                if r._right_side_aligns(right_side)}
+        signature = tuple(
+            (inst.variable, len(inst.string_spans))
+            for inst in right_side
+        )
+        return self._rules_by_rhs.get(signature, frozenset())
     
 
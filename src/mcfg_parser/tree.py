@@ -1,14 +1,18 @@
 import re
-import pyparsing # type: ignore
-from typing import TypeVar, Optional
+import sys
+import weakref
+from typing import TYPE_CHECKING, Optional
 from collections.abc import Hashable, Callable
-from typing import Literal
 from functools import lru_cache
 
 
 DataType = Hashable
-TreeList = list[str, Optional[list['TreeList']]]
-TreeTuple = tuple[DataType, Optional[tuple['TreeTuple', ...]]]
+
+if TYPE_CHECKING:
+    TreeList = list[str, Optional[list['TreeList']]]
+    TreeTuple = tuple[DataType, Optional[tuple['TreeTuple', ...]]]
+
+TOKEN_RE = re.compile(r'[()]|[^()\s]+')
 
 
 class Tree:
@@ -23,7 +27,7 @@ class Tree:
     Attributes
     ----------
     data : DataType
-    children : list(Tree)
+    children : tuple(Tree)
     terminals : list(str)
 
     Methods
@@ -33,22 +37,24 @@ class Tree:
     from_string, from_list, 
     check_depth, check_for_loops
     """
-    LPAR = pyparsing.Suppress('(')
-    RPAR = pyparsing.Suppress(')')
-    DATA = pyparsing.Regex(r'[^\(\)\s]+')
-
-    PARSER = pyparsing.Forward()
-    SUBTREE = pyparsing.ZeroOrMore(PARSER)
-    PARSERLIST = pyparsing.Group(LPAR + DATA + SUBTREE + RPAR)
-    PARSER <<= DATA | PARSERLIST
-    
-    def __init__(self, data: DataType, children: list['Tree'] = []):
-        self._data = data
-        self._children = children
-        
+    __slots__ = ('_data', '_children', '_tuple', '_hash', '_terminals', '_labels', '__weakref__')
+
+    POOL_LIMIT = 2**16
+    _pool: list['Tree'] = []
+    _canonical_cache = weakref.WeakValueDictionary()
+    _indent_prefixes: dict[int, str] = {}
+
+    def __init__(self, data: DataType, children: list['Tree'] | None = None):
+        self._data = sys.intern(data) if isinstance(data, str) else data
+        self._children = () if children is None else tuple(children)
+        self._tuple = None
+        self._hash = None
+        self._terminals = None
+        self._labels = None
+
         self._validate()
 
-    def to_tuple(self) -> TreeTuple:
+    def to_tuple(self) -> 'TreeTuple':
         """
         Converts the tree into a tuple representation
 
@@ -56,12 +62,30 @@ class Tree:
         -------
         TreeTuple
         """
-        return self._data, tuple(c.to_tuple() for c in self._children)
+        if self._tuple is None:
+            stack = [(self, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if node._tuple is not None:
+                    continue
+                if not expanded:
+                    stack.append((node, True))
+                    stack.extend((c, False) for c in node._children)
+                else:
+                    node._tuple = (node._data,
+                                   tuple(c._tuple for c in node._children))
+        return self._tuple
 
     def __hash__(self) -> int:
-        return hash(self.to_tuple())
+        if self._hash is None:
+            self._hash = hash(self.to_tuple())
+        return self._hash
     
     def __eq__(self, other: 'Tree') -> bool:
+        if self is other:
+            return True
+        if hash(self) != hash(other):
+            return False
         return self.to_tuple() == other.to_tuple()
 
     def __str__(self) -> str:
@@ -82,57 +106,67 @@ class Tree:
         -------
         str
         """
-        s = (depth - 1) * '  ' +\
-            int(depth > 0) * '--' +\
-            self._data + '\n'
-        s += ''.join(c.to_string(depth+1)
-                     for c in self._children)
-        
-        return s
+        prefixes = self._indent_prefixes
+        parts = []
+        stack = [(self, depth)]
+        while stack:
+            node, node_depth = stack.pop()
+            prefix = prefixes.get(node_depth)
+            if prefix is None:
+                prefix = prefixes[node_depth] = (node_depth - 1) * '  ' +\
+                    int(node_depth > 0) * '--'
+            parts.append(prefix + node._data + '\n')
+            stack.extend((c, node_depth + 1)
+                         for c in reversed(node._children))
+        return ''.join(parts)
     
     def __contains__(self, data: DataType) -> bool:
-        if self._data == data:
-            return True
-        else:
-            for child in self._children:
-                if data in child:
-                    return True
-                
-            return False
+        if self._labels is None:
+            labels = set()
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if node._labels is not None:
+                    labels |= node._labels
+                    continue
+                labels.add(node._data)
+                stack.extend(node._children)
+            self._labels = frozenset(labels)
+        return data in self._labels
         
     def __getitem__(self, idx: int | tuple[int, ...]) -> 'Tree':
         if isinstance(idx, int):
             return self._children[idx]
-        elif len(idx) == 1:
-            return self._children[idx[0]]
-        elif idx:
-            return self._children[idx[0]].__getitem__(idx[1:])
-        else:
-            return self
+        node = self
+        for i in idx:
+            node = node._children[i]
+        return node
         
     @property
     def data(self) -> DataType:
         return self._data 
     
     @property
-    def children(self) -> list['Tree']:
+    def children(self) -> tuple['Tree', ...]:
         return self._children
      
     @property
     def terminals(self) -> list[str]:
-        if self._children:
-            return [w for c in self._children 
-                    for w in c.terminals]
-        else:
-            return [str(self._data)]
+        if self._terminals is None:
+            if self._children:
+                terminals = []
+                for c in self._children:
+                    terminals.extend(c.terminals)
+                self._terminals = terminals
+            else:
+                self._terminals = [str(self._data)]
+        return self._terminals
         
     def _validate(self) -> None:
-        try:
-            assert all(isinstance(c, Tree)
-                       for c in self._children)
-        except AssertionError:
-            msg = 'all children must be trees'
-            raise TypeError(msg)
+        for c in self._children:
+            if not isinstance(c, Tree):
+                msg = 'all children must be trees'
+                raise TypeError(msg)
             
     def index(self, data: DataType, index_path: tuple[int, ...] = tuple()) -> list[tuple[int, ...]]:
         """
@@ -147,13 +181,16 @@ class Tree:
         -------
         list[tuple]
         """
-        indices = [index_path] if self._data==data else []
-        root_path = [] if index_path == -1 else index_path
-        
-        indices += [j 
-                    for i, c in enumerate(self._children) 
-                    for j in c.index(data, root_path+(i,))]
-
+        indices = []
+        stack = [(self, index_path)]
+        while stack:
+            node, path = stack.pop()
+            if node._labels is not None and data not in node._labels:
+                continue
+            if node._data == data:
+                indices.append(path)
+            stack.extend((c, path+(i,))
+                         for i, c in reversed(list(enumerate(node._children))))
         return indices
     
     def relabel(self, label_map: Callable[[DataType], DataType], 
@@ -171,21 +208,33 @@ class Tree:
         -------
         Tree
         """
-        if not nonterminals_only and not terminals_only:
-            data = label_map(self._data)
-        elif nonterminals_only and self._children:
-            data = label_map(self._data)
-        elif terminals_only and not self._children:
-            data = label_map(self._data)
-        else:
-            data = self._data
-        
-        children = [c.relabel(label_map, nonterminals_only, terminals_only) 
-                    for c in self._children]
-        
-        return self.__class__(data, children)
+        rebuilt = {}
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in rebuilt:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((c, False) for c in node._children)
+                continue
+
+            if not nonterminals_only and not terminals_only:
+                data = label_map(node._data)
+            elif nonterminals_only and node._children:
+                data = label_map(node._data)
+            elif terminals_only and not node._children:
+                data = label_map(node._data)
+            else:
+                data = node._data
+
+            children = [rebuilt[id(c)] for c in node._children]
+            rebuilt[id(node)] = node.__class__(data, children)
+
+        return rebuilt[id(self)]
     
     @classmethod
+    @lru_cache(2**10)
     def from_string(cls, treestr: str) -> 'Tree':
         """
         Creates a tree from a string representation
@@ -198,12 +247,26 @@ class Tree:
         ------
         Tree
         """
-        treelist = cls.PARSER.parseString(treestr[2:-2])[0]
-        
+        treelist = cls._parse_treestr(treestr[2:-2])
+
         return cls.from_list(treelist)
+
+    @classmethod
+    def _parse_treestr(cls, treestr: str) -> 'TreeList':
+        """Tokenize a parenthesized tree string into a TreeList in one pass"""
+        stack = [[]]
+        for token in TOKEN_RE.findall(treestr):
+            if token == '(':
+                stack.append([])
+            elif token == ')':
+                subtree = stack.pop()
+                stack[-1].append(subtree)
+            else:
+                stack[-1].append(token)
+        return stack[0][0]
     
     @classmethod
-    def from_list(cls, treelist: TreeList) -> 'Tree':
+    def from_list(cls, treelist: 'TreeList') -> 'Tree':
         """
         Creates a tree from a TreeList representation
 
@@ -217,11 +280,133 @@ class Tree:
         """
         if isinstance(treelist, str):
             return cls(treelist[0])
-        elif isinstance(treelist[1], str):
-            return cls(treelist[0], [cls(treelist[1])])
-        else:
-            return cls(treelist[0], [cls.from_list(l) for l in treelist[1:]])
+
+        data, first_child = treelist[0], treelist[1]
+        if isinstance(first_child, str):
+            return cls(data, [cls(first_child)])
+        return cls(data, [cls(l[0]) if isinstance(l, str) else cls.from_list(l)
+                          for l in treelist[1:]])
         
+    @classmethod
+    def canonical(cls, data: DataType, children: list['Tree'] | None = None) -> 'Tree':
+        """
+        Returns a canonical instance for the given data and children, so
+        structurally identical subtrees built through this constructor
+        share one object; entries are dropped automatically once no
+        canonical tree references them
+
+        Parameters
+        ----------
+        data : DataType
+        children : list(Tree)
+
+        Returns
+        -------
+        Tree
+        """
+        children = [] if children is None else children
+        key = (cls, data, tuple(c.to_tuple() for c in children))
+        cached = cls._canonical_cache.get(key)
+        if cached is None:
+            cached = cls(data, children)
+            cls._canonical_cache[key] = cached
+        return cached
+
+    @classmethod
+    def acquire(cls, data: DataType, children: list['Tree'] | None = None) -> 'Tree':
+        """
+        Builds a node, reusing one from the free list when available
+
+        Parameters
+        ----------
+        data : DataType
+        children : list(Tree)
+
+        Returns
+        -------
+        Tree
+        """
+        if cls._pool:
+            node = cls._pool.pop()
+            node._data = sys.intern(data) if isinstance(data, str) else data
+            node._children = () if children is None else tuple(children)
+            node._tuple = None
+            node._hash = None
+            node._terminals = None
+            node._labels = None
+            node._validate()
+            return node
+        return cls(data, children)
+
+    def release(self) -> None:
+        """
+        Returns this node and its descendants to the free list for reuse
+        by acquire; only call on throwaway trees the caller owns, since
+        any other reference to a released node becomes invalid
+
+        Returns
+        -------
+        None
+        """
+        pool = type(self)._pool
+        limit = type(self).POOL_LIMIT
+        stack = [self]
+        while stack and len(pool) < limit:
+            node = stack.pop()
+            stack.extend(node._children)
+            node._children = ()
+            node._tuple = None
+            node._hash = None
+            node._terminals = None
+            node._labels = None
+            pool.append(node)
+
+    def to_arrays(self) -> tuple[list[DataType], list[int]]:
+        """
+        Flattens the tree into parallel pre-order arrays of node data and
+        parent indices, a compact layout for whole-forest operations
+
+        Returns
+        -------
+        tuple[list[DataType], list[int]]
+            the root's parent index is -1
+        """
+        data = []
+        parents = []
+        stack = [(self, -1)]
+        while stack:
+            node, parent = stack.pop()
+            position = len(data)
+            data.append(node._data)
+            parents.append(parent)
+            stack.extend((c, position)
+                         for c in reversed(node._children))
+        return data, parents
+
+    @classmethod
+    def from_arrays(cls, data: list[DataType], parents: list[int]) -> 'Tree':
+        """
+        Rebuilds a tree from the parallel arrays produced by to_arrays
+
+        Parameters
+        ----------
+        data : list[DataType]
+        parents : list[int]
+
+        Returns
+        -------
+        Tree
+        """
+        child_indices = [[] for _ in data]
+        for i, parent in enumerate(parents):
+            if parent >= 0:
+                child_indices[parent].append(i)
+
+        nodes = [None] * len(data)
+        for i in range(len(data) - 1, -1, -1):
+            nodes[i] = cls(data[i], [nodes[j] for j in child_indices[i]])
+        return nodes[0]
+
     def check_depth(self, depth: int=0, threshold: int=100) -> None:
         """
         Checks if the depth of the tree exceeds a given threshold
@@ -236,29 +421,43 @@ class Tree:
         None
         
         """
-        if depth > threshold: 
-            print(f"Warning: Tree depth exceeds expected range at depth {depth}")
-        for child in self.children:
-            child.check_depth(depth + 1)
+        stack = [(self, depth)]
+        while stack:
+            node, node_depth = stack.pop()
+            if node_depth > threshold:
+                print(f"Warning: Tree depth exceeds expected range at depth {node_depth}")
+            stack.extend((c, node_depth + 1) for c in node.children)
 
     def check_for_loops(self, visited: set=None) -> None:
         """
         Checks if the tree has a loop that will cause some functions to hang.
+        Subtrees shared between branches (e.g. via canonical) are fine;
+        only a node reachable from itself raises.
 
         Parameters
         ----------
-        visited : set(int)
+        visited : set(int), ids of nodes already known to be loop-free
 
         Returns
         -------
         None
-        
+
         """
-        if visited is None:
-            visited = set()
-        if id(self) in visited:
-            raise Exception("Circular reference detected")
-        visited.add(id(self))
-        for child in self.children:
-            child.check_for_loops(visited)
+        finished = set() if visited is None else visited
+        on_path = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            node_id = id(node)
+            if expanded:
+                on_path.discard(node_id)
+                finished.add(node_id)
+                continue
+            if node_id in on_path:
+                raise Exception("Circular reference detected")
+            if node_id in finished:
+                continue
+            on_path.add(node_id)
+            stack.append((node, True))
+            stack.extend((c, False) for c in node.children)
 
@@ -1,6 +1,5 @@
 import sys
 import os
-from copy import deepcopy
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
@@ -207,8 +206,13 @@ class TestMCFG:
     @pytest.fixture(scope='module')
     def mcfg(self, literal_rules):
         initiated_rules = {grammar.MCFGRule.from_string(r) for r in literal_rules}
-        all_elements = {i for r in initiated_rules for i in deepcopy(r.right_side) + ((deepcopy(r.left_side)),)}
-        start_variables = {i for i in all_elements if i.variable == 'S'}
+        all_elements = set()
+        start_variables = set()
+        for r in initiated_rules:
+            for e in r.right_side + (r.left_side,):
+                all_elements.add(e)
+                if e.variable == 'S':
+                    start_variables.add(e)
         grammar.MultipleContextFreeGrammar.parser_class = abparser.AgendaBasedParser
         return grammar.MultipleContextFreeGrammar(
                 alphabet={'the', 'a', 'greyhound', 'salmon', 'human', 'believe', 'believes', 'see', 'saw', 'who', 'which', 'does', 'did', 'that', 'with'},
@@ -219,7 +223,7 @@ class TestMCFG:
     def test_init(self, mcfg: grammar.MultipleContextFreeGrammar, literal_rules):
         assert mcfg._alphabet == {'the', 'a', 'greyhound', 'salmon', 'human', 'believe', 'believes', 'see', 'saw', 'who', 'which', 'does', 'did', 'that', 'with'}
         initiated_rules = {grammar.MCFGRule.from_string(r) for r in literal_rules}
-        assert mcfg._variables == {i for r in initiated_rules for i in deepcopy(r.right_side) + ((deepcopy(r.left_side)),)}
+        assert mcfg._variables == {i for r in initiated_rules for i in r.right_side + (r.left_side,)}
         assert mcfg._rules == initiated_rules
         assert mcfg._start_variables == {grammar.MCFGRuleElement('S', (1, 0, 2)), 
                                          grammar.MCFGRuleElement('S', (0, 2, 1)), 
@@ -6,7 +6,6 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from mcfg_parser import abparser
 from mcfg_parser import grammar as gr
 import pytest # type: ignore
-from copy import deepcopy
 
 
 class TestABEntry:
@@ -101,8 +100,13 @@ class TestAgendaBasedParser:
                     "C(that)",
                     "P(with)"]
         initiated_rules = {gr.MCFGRule.from_string(r) for r in literal_rules}
-        all_elements = {i for r in initiated_rules for i in deepcopy(r.right_side) + ((deepcopy(r.left_side)),)}
-        start_variables = {i for i in all_elements if i.variable == 'S'}
+        all_elements = set()
+        start_variables = set()
+        for r in initiated_rules:
+            for e in r.right_side + (r.left_side,):
+                all_elements.add(e)
+                if e.variable == 'S':
+                    start_variables.add(e)
         gr.MultipleContextFreeGrammar.parser_class = abparser.AgendaBasedParser
         return gr.MultipleContextFreeGrammar(
                 alphabet={'the', 'a', 'greyhound', 'salmon', 'human', 'believe', 'believes', 'see', 'saw', 'who', 'which', 'does', 'did', 'that', 'with'},
@@ -113,6 +117,10 @@ class TestAgendaBasedParser:
     @pytest.fixture(scope='module')
     def parser(self, mcfg):
         return abparser.AgendaBasedParser(mcfg)
+
+    @pytest.fixture(scope='module')
+    def chart_basic(self, parser):
+        return parser._fill_chart(['the', 'human', 'saw', 'the', 'greyhound'])
     
     def test_init(self, parser: abparser.AgendaBasedParser, mcfg: gr.MultipleContextFreeGrammar):
         assert parser.grammar.alphabet == mcfg.alphabet
@@ -161,23 +169,28 @@ class TestAgendaBasedParser:
         for e in incorrect_examples:
             assert parser._recognize(e) == False
 
+    def test_parse_batch(self, parser: abparser.AgendaBasedParser, correct_examples, incorrect_examples):
+        examples = correct_examples + incorrect_examples
+        expected = [True] * len(correct_examples) + [False] * len(incorrect_examples)
+        assert parser.parse_batch(examples) == expected
+        assert parser.parse_batch(examples, max_workers=1) == expected
+
     def test_combine(self, parser: abparser.AgendaBasedParser):
         entry_1 = abparser.ABEntry(gr.MCFGRuleElementInstance('VP', (2, 5)), 3, ((2, gr.MCFGRuleElement('Vpres', (2,))), (3, gr.MCFGRuleElement('NP', (3,5)))))
         entry_2 = abparser.ABEntry(gr.MCFGRuleElementInstance('N', (1, 2)), 1, (None, None))
         answer = (gr.MCFGRuleElementInstance('Src', (1, 2), (2, 5)),)
         assert parser._combine(entry_1, entry_2) == (1, answer)
 
-    def test_fill_chart(self, parser: abparser.AgendaBasedParser):
+    def test_fill_chart(self, parser: abparser.AgendaBasedParser, chart_basic):
         answer = "['0:D((0, 1),) -> (None, None)', '1:N((1, 2),) -> (None, None)', '2:N((2, 3),) -> (None, None)', '3:Vpres((2, 3),) -> (None, None)', '4:D((3, 4),) -> (None, None)', '5:N((4, 5),) -> (None, None)', '6:NP((0, 2),) -> (0, D, 1, N)', '7:VPrc((1, 2), (2, 3)) -> (1, N, 3, Vpres)', '8:VPrc((2, 3), (2, 3)) -> (2, N, 3, Vpres)', '9:VPrc((4, 5), (2, 3)) -> (5, N, 3, Vpres)', '10:NP((3, 5),) -> (4, D, 5, N)', '11:Src((1, 2), (0, 3)) -> (6, NP, 7, VPrc)', '12:Src((2, 3), (0, 3)) -> (6, NP, 8, VPrc)', '13:Src((4, 5), (0, 3)) -> (6, NP, 9, VPrc)', '14:VP((2, 5),) -> (3, Vpres, 10, NP)', '15:Src((1, 2), (2, 5)) -> (1, N, 14, VP)', '16:Src((2, 3), (2, 5)) -> (2, N, 14, VP)', '17:Src((4, 5), (2, 5)) -> (5, N, 14, VP)', '18:S((0, 5),) -> (6, NP, 14, VP)']"
-        assert str([repr(e) for e in parser._fill_chart(['the', 'human', 'saw', 'the', 'greyhound'])]) == answer
+        assert str([repr(e) for e in chart_basic]) == answer
 
-    def test_get_item(self, parser: abparser.AgendaBasedParser):
-        chart = parser._fill_chart(['the', 'human', 'saw', 'the', 'greyhound'])
-        assert repr(parser._get_item(chart, 6)) == "6:NP((0, 2),) -> (0, D, 1, N)"
-    
-    def test_construct_parses(self, parser: abparser.AgendaBasedParser):
+    def test_get_item(self, parser: abparser.AgendaBasedParser, chart_basic):
+        assert repr(parser._get_item(chart_basic, 6)) == "6:NP((0, 2),) -> (0, D, 1, N)"
+
+    def test_construct_parses(self, parser: abparser.AgendaBasedParser, chart_basic):
         string = ['the', 'human', 'saw', 'the', 'greyhound']
-        chart = parser._fill_chart(string)
+        chart = chart_basic
         sv = {ele.variable for ele in parser.grammar._start_variables}
         start_nodes = [entry for entry in chart if entry.symbol.variable in sv and entry.symbol._string_spans == ((0, len(string)),)]
         answer = 'S\n--NP\n  --D(the)\n  --N(human)\n--VP\n  --Vpres(saw)\n  --NP\n    --D(the)\n    --N(greyhound)\n'
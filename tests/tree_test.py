@@ -49,6 +49,24 @@ class TestTree:
         assert self.tree.index("VP") == [(1,)]
         assert self.tree.index("S") == [()]
 
+    def test_canonical(self):
+        first = Tree.canonical("NP", [Tree.canonical("D(the)"), Tree.canonical("N(dog)")])
+        second = Tree.canonical("NP", [Tree.canonical("D(the)"), Tree.canonical("N(dog)")])
+        assert first is second
+        assert first == self.tree[0]
+
+    def test_acquire_release(self):
+        scratch = Tree("S", [Tree("NP"), Tree("VP")])
+        scratch.release()
+        reused = Tree.acquire("X", [Tree.acquire("Y")])
+        assert reused.to_tuple() == ("X", (("Y", ()),))
+
+    def test_to_arrays(self):
+        data, parents = self.tree.to_arrays()
+        assert data == ["S", "NP", "D(the)", "N(dog)", "VP", "V(barked)"]
+        assert parents == [-1, 0, 1, 1, 0, 4]
+        assert Tree.from_arrays(data, parents) == self.tree
+
     def test_relabel(self):
         label_map = lambda x: x.lower()
         relabeled_tree = self.tree.relabel(label_map)